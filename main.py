@@ -24,8 +24,11 @@ def main():
             game.handle_event(event)
 
         game.update(dt)
-        game.render(screen)
-        pygame.display.flip()
+        dirty = game.render(screen)
+        if dirty is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
 
     pygame.quit()
     sys.exit(0)
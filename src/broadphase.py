@@ -0,0 +1,41 @@
+class SpatialHashGrid:
+    # Uniform grid used as a collision broad-phase. Objects are bucketed by
+    # every cell their bounding circle overlaps; a query only visits the few
+    # cells around the probe instead of every object.
+    def __init__(self, cell: int = 32):
+        self.cell = cell
+        self.cells = {}  # dict[(cx, cy)] -> list[obj]
+
+    def clear(self):
+        self.cells.clear()
+
+    def insert(self, obj, x: float, y: float, r: float):
+        c = self.cell
+        cx0, cy0 = int((x - r) // c), int((y - r) // c)
+        cx1, cy1 = int((x + r) // c), int((y + r) // c)
+        cells = self.cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [obj]
+                else:
+                    bucket.append(obj)
+
+    def query(self, x: float, y: float, r: float):
+        # Yields each candidate once, even if it spans several probed cells
+        c = self.cell
+        cx0, cy0 = int((x - r) // c), int((y - r) // c)
+        cx1, cy1 = int((x + r) // c), int((y + r) // c)
+        cells = self.cells
+        seen = set()
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for obj in bucket:
+                    oid = id(obj)
+                    if oid not in seen:
+                        seen.add(oid)
+                        yield obj
@@ -1,10 +1,12 @@
 import math
 import random
-from dataclasses import dataclass
 from typing import Optional, Tuple
 
+import numpy as np
 import pygame
 
+from .patterns import PATTERN_FNS
+
 Vec2 = pygame.math.Vector2
 
 
@@ -12,24 +14,173 @@ def clamp(v, lo, hi):
     return max(lo, min(hi, v))
 
 
-@dataclass
-class Bullet:
-    pos: Vec2
-    vel: Vec2
-    radius: int
-    friendly: bool
-    damage: int = 1
+def circles_hit(ax, ay, ar, bx, by, br):
+    # Circle-vs-circle overlap on squared distance; no Rect allocation
+    dx = ax - bx
+    dy = ay - by
+    rr = ar + br
+    return dx * dx + dy * dy <= rr * rr
 
-    def update(self, dt: float):
-        self.pos += self.vel * dt
 
-    def rect(self) -> pygame.Rect:
-        r = self.radius
-        return pygame.Rect(int(self.pos.x - r), int(self.pos.y - r), r * 2, r * 2)
+def compact(lst, keep):
+    # In-place swap-remove of items failing keep(); O(n), no new list.
+    # Does not preserve order.
+    i, n = 0, len(lst)
+    while i < n:
+        if keep(lst[i]):
+            i += 1
+        else:
+            n -= 1
+            lst[i] = lst[n]
+    del lst[n:]
+
+
+_INV_SQRT2 = 0.5 ** 0.5
+
+
+# Pre-rendered sprites. Each shape is rasterized once into an SRCALPHA
+# surface and blitted afterwards; keys include the colors so a different
+# Settings palette gets its own entry.
+_SPRITES = {}
+
+
+def _cached_sprite(key, build):
+    surf = _SPRITES.get(key)
+    if surf is None:
+        surf = _SPRITES[key] = build()
+    return surf
+
+
+def circle_sprite(color, r: int, width: int = 0):
+    # Circle centered at (r + 1, r + 1); blit at (x - r - 1, y - r - 1)
+    def build():
+        surf = pygame.Surface((r * 2 + 2, r * 2 + 2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, color, (r + 1, r + 1), r, width)
+        return surf
+    return _cached_sprite(("circle", color, r, width), build)
+
+
+def _player_sprite(settings):
+    # Triangle ship; the ship's center sits at (19, 23)
+    def build():
+        surf = pygame.Surface((38, 42), pygame.SRCALPHA)
+        pts = [(19, 1), (1, 41), (37, 41)]
+        pygame.draw.polygon(surf, settings.PLAYER, pts)
+        pygame.draw.polygon(surf, (20, 30, 50), pts, 2)
+        return surf
+    return _cached_sprite(("player", settings.PLAYER), build)
+
+
+def _enemy_sprite(settings, r: int):
+    def build():
+        surf = pygame.Surface((r * 2 + 2, r * 2 + 2), pygame.SRCALPHA)
+        c = (r + 1, r + 1)
+        pygame.draw.circle(surf, settings.ENEMY, c, r)
+        # eye
+        pygame.draw.circle(surf, (20, 20, 30), (c[0] - 5, c[1] - 3), 4)
+        pygame.draw.circle(surf, (20, 20, 30), (c[0] + 6, c[1] - 3), 4)
+        # outline
+        pygame.draw.circle(surf, (60, 20, 30), c, r, 2)
+        return surf
+    return _cached_sprite(("enemy", settings.ENEMY, r), build)
+
+
+def _powerup_sprite(settings, kind: str, r: int):
+    def build():
+        surf = pygame.Surface((r * 2 + 2, r * 2 + 2), pygame.SRCALPHA)
+        p = (r + 1, r + 1)
+        pygame.draw.circle(surf, settings.POWERUP, p, r)
+        # inner icon
+        if kind == PowerUp.SPREAD:
+            pygame.draw.line(surf, (20, 40, 20), (p[0]-6, p[1]+3), (p[0], p[1]-6), 2)
+            pygame.draw.line(surf, (20, 40, 20), (p[0]+6, p[1]+3), (p[0], p[1]-6), 2)
+        elif kind == PowerUp.RAPID:
+            pygame.draw.line(surf, (20, 40, 20), (p[0]-6, p[1]+6), (p[0]+6, p[1]-6), 2)
+        elif kind == PowerUp.SHIELD:
+            pygame.draw.circle(surf, (20, 40, 20), p, 6, 2)
+        else:
+            pygame.draw.circle(surf, (20, 40, 20), p, 5)
+            pygame.draw.line(surf, (20, 40, 20), (p[0], p[1]-8), (p[0], p[1]+8), 2)
+        return surf
+    return _cached_sprite(("powerup", settings.POWERUP, kind, r), build)
+
+
+class BulletPool:
+    # Struct-of-arrays bullet storage: one NumPy array per field, live bullets
+    # packed into [0, count). Movement and culling run as whole-array ops.
+    # Player and enemy bullets live in separate pools, so no side filtering.
+    def __init__(self, friendly: bool, capacity: int = 512):
+        self.friendly = friendly
+        self.count = 0
+        self._alloc(capacity)
+
+    def _alloc(self, capacity: int):
+        self.capacity = capacity
+        self.pos_x = np.zeros(capacity, dtype=np.float32)
+        self.pos_y = np.zeros(capacity, dtype=np.float32)
+        self.vel_x = np.zeros(capacity, dtype=np.float32)
+        self.vel_y = np.zeros(capacity, dtype=np.float32)
+        self.radius = np.zeros(capacity, dtype=np.int32)
+        self.damage = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def _arrays(self):
+        return (self.pos_x, self.pos_y, self.vel_x, self.vel_y,
+                self.radius, self.damage, self.alive)
+
+    def _grow(self):
+        old, n = self._arrays(), self.count
+        self._alloc(self.capacity * 2)
+        for dst, src in zip(self._arrays(), old):
+            dst[:n] = src[:n]
+
+    def __len__(self):
+        return self.count
+
+    def add(self, x: float, y: float, vx: float, vy: float, r: int, damage: int = 1):
+        if self.count >= self.capacity:
+            self._grow()
+        i = self.count
+        self.pos_x[i] = x
+        self.pos_y[i] = y
+        self.vel_x[i] = vx
+        self.vel_y[i] = vy
+        self.radius[i] = r
+        self.damage[i] = damage
+        self.alive[i] = True
+        self.count = i + 1
+
+    def kill(self, i: int):
+        self.alive[i] = False
+
+    def update(self, dt: float):
+        n = self.count
+        self.pos_x[:n] += self.vel_x[:n] * dt
+        self.pos_y[:n] += self.vel_y[:n] * dt
+
+    def cull(self, w: int, h: int):
+        # Drop dead and off-screen bullets, packing survivors to the front
+        n = self.count
+        px, py = self.pos_x[:n], self.pos_y[:n]
+        keep = np.flatnonzero((py > -50) & (py < h + 80) & (px > -60) & (px < w + 60) & self.alive[:n])
+        k = len(keep)
+        if k == n:
+            return
+        for arr in self._arrays():
+            arr[:k] = arr[keep]
+        self.count = k
 
     def draw(self, surf, settings):
+        n = self.count
         color = settings.BULLET if self.friendly else settings.ENEMY_BULLET
-        pygame.draw.circle(surf, color, (int(self.pos.x), int(self.pos.y)), self.radius)
+        sprites = {}
+        ops = []
+        for x, y, r in zip(self.pos_x[:n].tolist(), self.pos_y[:n].tolist(), self.radius[:n].tolist()):
+            sprite = sprites.get(r)
+            if sprite is None:
+                sprite = sprites[r] = circle_sprite(color, r)
+            ops.append((sprite, (int(x) - r - 1, int(y) - r - 1)))
+        return surf.blits(ops)
 
 
 class Player:
@@ -47,6 +198,18 @@ class Player:
 
         self.fire_cd = 0.0
 
+        # movement keys resolved once: left, a, right, d, up, w, down, s
+        self._keys = (pygame.K_LEFT, pygame.K_a, pygame.K_RIGHT, pygame.K_d,
+                      pygame.K_UP, pygame.K_w, pygame.K_DOWN, pygame.K_s)
+
+        # 3-shot spread velocities (-14, 0, +14 degrees off straight up), computed once
+        bs = settings.BULLET_SPEED
+        self._spread_dirs = tuple((math.sin(math.radians(a)) * bs, -math.cos(math.radians(a)) * bs)
+                                  for a in (-14, 0, 14))
+
+        self.sprite = _player_sprite(settings)
+        self.shield_sprite = circle_sprite(settings.SHIELD, 30, 2)
+
     def is_alive(self):
         return self.lives > 0
 
@@ -58,20 +221,17 @@ class Player:
 
     def update(self, dt: float, keys):
         s = self.settings
-        move = Vec2(0, 0)
-        if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-            move.x -= 1
-        if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-            move.x += 1
-        if keys[pygame.K_UP] or keys[pygame.K_w]:
-            move.y -= 1
-        if keys[pygame.K_DOWN] or keys[pygame.K_s]:
-            move.y += 1
-
-        if move.length_squared() > 0:
-            move = move.normalize()
-
-        self.pos += move * s.PLAYER_SPEED * dt
+        kl, ka, kr, kd, ku, kw, kdn, ks = self._keys
+        mx = (keys[kr] | keys[kd]) - (keys[kl] | keys[ka])
+        my = (keys[kdn] | keys[ks]) - (keys[ku] | keys[kw])
+
+        step = s.PLAYER_SPEED * dt
+        if mx and my:
+            # diagonal: same result as normalizing (1, 1)
+            step *= _INV_SQRT2
+
+        self.pos.x += mx * step
+        self.pos.y += my * step
         self.pos.x = clamp(self.pos.x, 30, s.W - 30)
         self.pos.y = clamp(self.pos.y, s.H * 0.55, s.H - 30)
 
@@ -85,18 +245,15 @@ class Player:
     def can_fire(self):
         return self.fire_cd <= 0.0
 
-    def shoot(self):
+    def shoot(self, bullets: BulletPool):
         self.fire_cd = self.fire_cooldown()
-        bullets = []
-        base_vel = Vec2(0, -self.settings.BULLET_SPEED)
+        x, y = self.pos.x, self.pos.y - 22
         if self.spread > 0:
             # 3-shot spread
-            for ang in (-14, 0, 14):
-                v = base_vel.rotate(ang)
-                bullets.append(Bullet(pos=self.pos.copy() + Vec2(0, -22), vel=v, radius=4, friendly=True))
+            for vx, vy in self._spread_dirs:
+                bullets.add(x, y, vx, vy, 4)
         else:
-            bullets.append(Bullet(pos=self.pos.copy() + Vec2(0, -22), vel=base_vel, radius=4, friendly=True))
-        return bullets
+            bullets.add(x, y, 0.0, -self.settings.BULLET_SPEED, 4)
 
     def hit(self):
         if self.shield > 0:
@@ -109,32 +266,33 @@ class Player:
         return True
 
     def draw(self, surf):
-        s = self.settings
         # player ship (triangle-ish)
         p = (int(self.pos.x), int(self.pos.y))
-        pts = [
-            (p[0], p[1] - 22),
-            (p[0] - 18, p[1] + 18),
-            (p[0] + 18, p[1] + 18),
-        ]
-        pygame.draw.polygon(surf, s.PLAYER, pts)
-        pygame.draw.polygon(surf, (20, 30, 50), pts, 2)
+        area = surf.blit(self.sprite, (p[0] - 19, p[1] - 23))
 
         if self.shield > 0:
             alpha = int(120 + 80 * math.sin(pygame.time.get_ticks() * 0.01))
-            # Draw shield ring
-            pygame.draw.circle(surf, s.SHIELD, p, 30, 2)
+            # Draw shield ring, pulsing via surface alpha
+            self.shield_sprite.set_alpha(alpha)
+            area.union_ip(surf.blit(self.shield_sprite, (p[0] - 31, p[1] - 31)))
+        return area
 
 
 class Enemy:
-    def __init__(self, settings, x: float, y: float, move_fn, hp: int = 1):
+    def __init__(self, settings, x: float, y: float, pattern_id: int, params,
+                 x_center: float = 0.0, hp: int = 1):
         self.settings = settings
-        self.spawn = Vec2(x, y)
-        self.pos = Vec2(x, y)
-        self.move_fn = move_fn
+        # plain floats: the per-frame update writes these without Vec2 temporaries
+        self.spawn_x, self.spawn_y = x, y
+        self.pos_x, self.pos_y = x, y
+        self.pat_id = pattern_id
+        self._move_fn = PATTERN_FNS[pattern_id]
+        self.params = tuple(params)
+        self._xc = x_center
         self.t = 0.0
         self.radius = 16
         self.hp = hp
+        self.sprite = _enemy_sprite(settings, self.radius)
 
         # Simple behavior state machine:
         # ENTER -> (OPTIONAL) ATTACK -> EXIT
@@ -163,39 +321,30 @@ class Enemy:
             self.state = "exit"
 
         # movement
-        x, y = self.move_fn(self.t, self.spawn.x, self.spawn.y)
-        self.pos.x, self.pos.y = x, y
+        self.pos_x, self.pos_y = self._move_fn(self.t, self.spawn_x, self.spawn_y, *self.params, self._xc)
 
         if self.state == "attack":
             # add a brief dive toward player area
-            self.pos.y += (120 + 40 * wave_speed_bonus) * dt
+            self.pos_y += (120 + 40 * wave_speed_bonus) * dt
         elif self.state == "exit":
-            self.pos.y += (160 + 60 * wave_speed_bonus) * dt
+            self.pos_y += (160 + 60 * wave_speed_bonus) * dt
 
-    def maybe_fire(self):
+    def maybe_fire(self, bullets: BulletPool):
         # Modest enemy shooting: downwards with small horizontal randomness
         if self.fire_cd > 0:
-            return None
+            return False
         self.fire_cd = random.uniform(1.0, 2.2)
         vx = random.uniform(-70.0, 70.0)
-        return Bullet(pos=self.pos.copy() + Vec2(0, 18), vel=Vec2(vx, 420.0), radius=4, friendly=False)
+        bullets.add(self.pos_x, self.pos_y + 18, vx, 420.0, 4)
+        return True
 
     def damage(self, n=1):
         self.hp -= n
 
-    def rect(self) -> pygame.Rect:
-        r = self.radius
-        return pygame.Rect(int(self.pos.x - r), int(self.pos.y - r), r * 2, r * 2)
-
-    def draw(self, surf):
-        s = self.settings
-        p = (int(self.pos.x), int(self.pos.y))
-        pygame.draw.circle(surf, s.ENEMY, p, self.radius)
-        # eye
-        pygame.draw.circle(surf, (20, 20, 30), (p[0] - 5, p[1] - 3), 4)
-        pygame.draw.circle(surf, (20, 20, 30), (p[0] + 6, p[1] - 3), 4)
-        # outline
-        pygame.draw.circle(surf, (60, 20, 30), p, self.radius, 2)
+    def blit_op(self):
+        # (source, dest) pair for a batched Surface.blits() call
+        r = self.radius + 1
+        return self.sprite, (int(self.pos_x) - r, int(self.pos_y) - r)
 
 
 class PowerUp:
@@ -207,34 +356,20 @@ class PowerUp:
 
     def __init__(self, settings, x: float, y: float, kind: str):
         self.settings = settings
-        self.pos = Vec2(x, y)
+        self.pos_x, self.pos_y = x, y
         self.kind = kind
         self.radius = 12
-        self.vel = Vec2(0, 140.0)
+        self.vel_x, self.vel_y = 0.0, 140.0
         self.t = 0.0
+        self.sprite = _powerup_sprite(settings, kind, self.radius)
 
     def update(self, dt: float):
         self.t += dt
-        self.pos += self.vel * dt
-        # small sway
-        self.pos.x += math.sin(self.t * 4.0) * 18.0 * dt
-
-    def rect(self):
-        r = self.radius
-        return pygame.Rect(int(self.pos.x - r), int(self.pos.y - r), r * 2, r * 2)
-
-    def draw(self, surf):
-        s = self.settings
-        p = (int(self.pos.x), int(self.pos.y))
-        pygame.draw.circle(surf, s.POWERUP, p, self.radius)
-        # inner icon
-        if self.kind == self.SPREAD:
-            pygame.draw.line(surf, (20, 40, 20), (p[0]-6, p[1]+3), (p[0], p[1]-6), 2)
-            pygame.draw.line(surf, (20, 40, 20), (p[0]+6, p[1]+3), (p[0], p[1]-6), 2)
-        elif self.kind == self.RAPID:
-            pygame.draw.line(surf, (20, 40, 20), (p[0]-6, p[1]+6), (p[0]+6, p[1]-6), 2)
-        elif self.kind == self.SHIELD:
-            pygame.draw.circle(surf, (20, 40, 20), p, 6, 2)
-        else:
-            pygame.draw.circle(surf, (20, 40, 20), p, 5)
-            pygame.draw.line(surf, (20, 40, 20), (p[0], p[1]-8), (p[0], p[1]+8), 2)
+        # drift plus small sway
+        self.pos_x += (self.vel_x + math.sin(self.t * 4.0) * 18.0) * dt
+        self.pos_y += self.vel_y * dt
+
+    def blit_op(self):
+        # (source, dest) pair for a batched Surface.blits() call
+        r = self.radius + 1
+        return self.sprite, (int(self.pos_x) - r, int(self.pos_y) - r)
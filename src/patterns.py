@@ -1,86 +1,118 @@
+import functools
 import math
 import random
 from dataclasses import dataclass
-from typing import Callable, List, Tuple
+from typing import List, Tuple
 
 Vec2 = Tuple[float, float]
 
 
+# Movement pattern ids. Each enemy carries one of these plus four float
+# params (p0..p3); PATTERN_FNS[pattern_id] evaluates the path at time t.
+PATTERN_LINE = 0   # p0=v
+PATTERN_V = 1      # p0=v, p1=wobble, p2=phase
+PATTERN_SINE = 2   # p0=v, p1=amp, p2=freq, p3=phase
+PATTERN_RING = 3   # p0=v, p1=ang, p2=radius, p3=shrink
+
+
 @dataclass
 class SpawnSpec:
-    # x,y are spawn positions; move_fn defines movement over time; meta can include enemy type
+    # x,y are spawn positions; pattern_id/params define movement over time; meta can include enemy type
     x: float
     y: float
-    move_fn: Callable[[float, float, float], Vec2]  # (t, x0, y0) -> (x, y)
+    pattern_id: int
+    params: Tuple[float, float, float, float]
+    x_center: float = 0.0  # ring patterns orbit this x
     fire_profile: str = "basic"  # reserved for future
 
 
-def line_pattern(count: int, width: float, y: float, x_center: float, speed: float) -> List[SpawnSpec]:
-    # Straight downward line of enemies spaced across a width
+# Pattern movement functions: (t, x0, y0, p0..p3, xc) -> (x, y).
+# Plain module functions rather than closures; every pattern drifts down at p0 px/s.
+def line_fn(t: float, x0: float, y0: float, p0: float, p1: float, p2: float, p3: float, xc: float) -> Vec2:
+    return x0, y0 + p0 * t
+
+
+def v_fn(t: float, x0: float, y0: float, p0: float, p1: float, p2: float, p3: float, xc: float) -> Vec2:
+    return x0 + math.sin(t * 1.6 + p2) * p1, y0 + p0 * t
+
+
+def sine_fn(t: float, x0: float, y0: float, p0: float, p1: float, p2: float, p3: float, xc: float) -> Vec2:
+    return x0 + math.sin(t * p2 + p3) * p1, y0 + p0 * t
+
+
+def ring_fn(t: float, x0: float, y0: float, p0: float, p1: float, p2: float, p3: float, xc: float) -> Vec2:
+    # Spiral in slightly while moving down
+    return xc + math.cos(p1 + t * 0.5) * (p2 * (1.0 - p3 * t)), y0 + p0 * t
+
+
+# Indexed by PATTERN_* id
+PATTERN_FNS = (line_fn, v_fn, sine_fn, ring_fn)
+
+
+# Formation skeletons depend only on their geometry arguments, so they are
+# cached across waves; per-enemy randomness is layered on top.
+@functools.lru_cache(maxsize=64)
+def _line_xs(count: int, width: float, x_center: float) -> Tuple[float, ...]:
     if count <= 1:
-        xs = [x_center]
-    else:
-        xs = [x_center - width / 2 + i * (width / (count - 1)) for i in range(count)]
+        return (x_center,)
+    return tuple(x_center - width / 2 + i * (width / (count - 1)) for i in range(count))
 
-    def mk_move_fn(v):
-        return lambda t, x0, y0: (x0, y0 + v * t)
 
-    return [SpawnSpec(x=x, y=y, move_fn=mk_move_fn(speed)) for x in xs]
+@functools.lru_cache(maxsize=64)
+def _v_offsets(count: int, spread: float, x_center: float) -> Tuple[Vec2, ...]:
+    # (x, dy) per enemy; dy is the slight vertical offset for the V shape
+    half = max(1, count // 2)
+    offsets = [(i - (count - 1) / 2.0) for i in range(count)]
+    return tuple((x_center + o * (spread / max(1, half)), abs(o) * 14) for o in offsets)
+
+
+@functools.lru_cache(maxsize=64)
+def _sine_xs(count: int, span: float, x_center: float) -> Tuple[float, ...]:
+    return tuple(x_center - span / 2 + (i + 0.5) * (span / count) for i in range(count))
+
+
+@functools.lru_cache(maxsize=64)
+def _ring_trig(count: int) -> Tuple[Tuple[float, float, float], ...]:
+    # (angle, cos, squashed sin) per ring slot
+    angs = [(i / count) * math.tau for i in range(count)]
+    return tuple((a, math.cos(a), math.sin(a) * 0.35) for a in angs)
+
+
+def line_pattern(count: int, width: float, y: float, x_center: float, speed: float) -> List[SpawnSpec]:
+    # Straight downward line of enemies spaced across a width
+    params = (speed, 0.0, 0.0, 0.0)
+    return [SpawnSpec(x=x, y=y, pattern_id=PATTERN_LINE, params=params) for x in _line_xs(count, width, x_center)]
 
 
 def v_pattern(count: int, spread: float, y: float, x_center: float, speed: float) -> List[SpawnSpec]:
     # V formation that drifts down
     # count should be odd ideally; we'll handle even counts.
-    half = max(1, count // 2)
     specs = []
-    for i in range(count):
-        offset = (i - (count - 1) / 2.0)
-        x = x_center + offset * (spread / max(1, half))
-        y_i = y + abs(offset) * 14  # slight vertical offset for V shape
-
-        def move_fn_factory():
-            v = speed
-            wobble = random.uniform(18.0, 34.0)
-            phase = random.uniform(0, math.tau)
-            return lambda t, x0, y0: (x0 + math.sin(t * 1.6 + phase) * wobble, y0 + v * t)
-
-        specs.append(SpawnSpec(x=x, y=y_i, move_fn=move_fn_factory()))
+    for x, dy in _v_offsets(count, spread, x_center):
+        wobble = random.uniform(18.0, 34.0)
+        phase = random.uniform(0, math.tau)
+        specs.append(SpawnSpec(x=x, y=y + dy, pattern_id=PATTERN_V, params=(speed, wobble, phase, 0.0)))
     return specs
 
 
 def sine_drift_pattern(count: int, span: float, y: float, x_center: float, speed: float) -> List[SpawnSpec]:
     # Enemies drift down while oscillating horizontally with different phases
     specs = []
-    for i in range(count):
-        x = x_center - span / 2 + (i + 0.5) * (span / count)
+    for x in _sine_xs(count, span, x_center):
         amp = random.uniform(40.0, 90.0)
         freq = random.uniform(1.0, 2.2)
         phase = random.uniform(0, math.tau)
-
-        def mf_factory(amp=amp, freq=freq, phase=phase, v=speed):
-            return lambda t, x0, y0: (x0 + math.sin(t * freq + phase) * amp, y0 + v * t)
-
-        specs.append(SpawnSpec(x=x, y=y, move_fn=mf_factory()))
+        specs.append(SpawnSpec(x=x, y=y, pattern_id=PATTERN_SINE, params=(speed, amp, freq, phase)))
     return specs
 
 
 def ring_pattern(count: int, radius: float, y: float, x_center: float, speed: float) -> List[SpawnSpec]:
     # Spawn enemies around a ring that slowly collapses as it moves down
     specs = []
-    for i in range(count):
-        ang = (i / count) * math.tau
-        x = x_center + math.cos(ang) * radius
-        y_i = y + math.sin(ang) * (radius * 0.35)
-
-        def mf_factory(ang=ang, r=radius, v=speed):
-            # Spiral in slightly while moving down
-            shrink = random.uniform(0.05, 0.12)
-            return lambda t, x0, y0: (
-                x_center + math.cos(ang + t * 0.5) * (r * (1.0 - shrink * t)),
-                y0 + v * t
-            )
-
-        specs.append(SpawnSpec(x=x, y=y_i, move_fn=mf_factory()))
+    for ang, c, sq in _ring_trig(count):
+        shrink = random.uniform(0.05, 0.12)
+        specs.append(SpawnSpec(x=x_center + c * radius, y=y + sq * radius, pattern_id=PATTERN_RING,
+                               params=(speed, ang, radius, shrink), x_center=x_center))
     return specs
 
 
@@ -1,35 +1,44 @@
 import random
+
+import numpy as np
 import pygame
 
-from .entities import Player, Enemy, PowerUp
+from .broadphase import SpatialHashGrid
+from .entities import BulletPool, Player, Enemy, PowerUp, circle_sprite, circles_hit, compact
 from .patterns import random_pattern
 from .ui import HUD
 
 
 class Starfield:
+    # Star columns as NumPy arrays so scrolling and respawn are whole-array ops
     def __init__(self, settings, count=160):
         self.settings = settings
-        self.stars = []
-        for _ in range(count):
-            x = random.uniform(0, settings.W)
-            y = random.uniform(0, settings.H)
-            sp = random.uniform(30, 150)
-            r = random.choice([1, 1, 2])
-            self.stars.append([x, y, sp, r])
+        # seeded from the random module so random.seed() still replays a run
+        self.rng = np.random.default_rng(random.getrandbits(64))
+        self.x = self.rng.uniform(0, settings.W, count).astype(np.float32)
+        self.y = self.rng.uniform(0, settings.H, count).astype(np.float32)
+        self.sp = self.rng.uniform(30, 150, count).astype(np.float32)
+        self.r = self.rng.choice([1, 1, 2], count).astype(np.int32)
+        self.sprites = {r: circle_sprite((160, 170, 200), r) for r in (1, 2)}
 
     def update(self, dt):
         s = self.settings
-        for st in self.stars:
-            st[1] += st[2] * dt
-            if st[1] > s.H:
-                st[0] = random.uniform(0, s.W)
-                st[1] = -2
-                st[2] = random.uniform(30, 150)
-                st[3] = random.choice([1, 1, 2])
+        self.y += self.sp * dt
+        wrapped = self.y > s.H
+        k = int(np.count_nonzero(wrapped))
+        if k:
+            rng = self.rng
+            self.x[wrapped] = rng.uniform(0, s.W, k)
+            self.y[wrapped] = -2
+            self.sp[wrapped] = rng.uniform(30, 150, k)
+            self.r[wrapped] = rng.choice([1, 1, 2], k)
 
     def draw(self, surf):
-        for x, y, _, r in self.stars:
-            pygame.draw.circle(surf, (160, 170, 200), (int(x), int(y)), r)
+        sprites = self.sprites
+        off = self.r + 1
+        xs = (self.x.astype(np.int32) - off).tolist()
+        ys = (self.y.astype(np.int32) - off).tolist()
+        return surf.blits([(sprites[r], (x, y)) for x, y, r in zip(xs, ys, self.r.tolist())])
 
 
 class WaveManager:
@@ -59,15 +68,22 @@ class WaveManager:
             if self.time_to_next <= 0:
                 self.next_wave()
 
-        # process spawn queue
-        for item in self.spawn_queue:
-            item["delay"] -= dt
-        ready = [it for it in self.spawn_queue if it["delay"] <= 0]
-        self.spawn_queue = [it for it in self.spawn_queue if it["delay"] > 0]
+        # process spawn queue: advance delays and pull out ready items in one pass
+        ready = []
+
+        def pending(it):
+            it["delay"] -= dt
+            if it["delay"] > 0:
+                return True
+            ready.append(it)
+            return False
+
+        compact(self.spawn_queue, pending)
 
         for it in ready:
             sp = it["spec"]
-            enemies.append(Enemy(self.settings, sp.x, sp.y, sp.move_fn, hp=self.settings.ENEMY_HP))
+            enemies.append(Enemy(self.settings, sp.x, sp.y, sp.pattern_id, sp.params,
+                                 x_center=sp.x_center, hp=self.settings.ENEMY_HP))
             self.total_spawned_this_wave += 1
 
     def difficulty_bonus(self):
@@ -76,6 +92,8 @@ class WaveManager:
 
 
 class PlayState:
+    GRID_MIN_PAIRS = 300
+
     def __init__(self, settings, on_game_over):
         self.settings = settings
         self.on_game_over = on_game_over
@@ -85,9 +103,13 @@ class PlayState:
         self.hud = HUD(settings)
 
         self.enemies = []
-        self.bullets = []
+        self.friendly_bullets = BulletPool(friendly=True)
+        self.enemy_bullets = BulletPool(friendly=False)
         self.powerups = []
 
+        # Broad-phase grid, reused across frames (cell ~ 2x enemy radius)
+        self.grid = SpatialHashGrid(cell=32)
+
         self.wave_mgr = WaveManager(settings)
         self.wave_mgr.next_wave()
 
@@ -99,6 +121,17 @@ class PlayState:
         self.paused = False
         self.flash = 0.0  # hit flash
 
+        # Dirty-rect rendering: areas drawn last frame get restored from the
+        # plain background instead of clearing the whole screen. None forces
+        # a full redraw (first frame, pause, hit flash).
+        self._background = pygame.Surface((settings.W, settings.H))
+        self._background.fill(settings.BG)
+        self._prev_rects = None
+
+        # Hit-flash tint, allocated once; only its surface alpha changes
+        self._flash_overlay = pygame.Surface((settings.W, settings.H), pygame.SRCALPHA).convert_alpha()
+        self._flash_overlay.fill((255, 80, 90, 255))
+
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
             if event.key in (pygame.K_ESCAPE, pygame.K_p):
@@ -145,7 +178,7 @@ class PlayState:
 
         # Shooting
         if keys[pygame.K_SPACE] and self.player.can_fire():
-            self.bullets.extend(self.player.shoot())
+            self.player.shoot(self.friendly_bullets)
 
         # Waves
         self.wave_mgr.update(dt, self.enemies)
@@ -154,13 +187,11 @@ class PlayState:
         # Enemies
         for e in self.enemies:
             e.update(dt, wave_speed_bonus=wave_bonus)
-            b = e.maybe_fire()
-            if b:
-                self.bullets.append(b)
+            e.maybe_fire(self.enemy_bullets)
 
         # Bullets and powerups
-        for b in self.bullets:
-            b.update(dt)
+        self.friendly_bullets.update(dt)
+        self.enemy_bullets.update(dt)
         for pu in self.powerups:
             pu.update(dt)
 
@@ -179,9 +210,10 @@ class PlayState:
         self.resolve_collisions()
 
         # Cleanup off-screen
-        self.bullets = [b for b in self.bullets if -50 < b.pos.y < s.H + 80 and -60 < b.pos.x < s.W + 60]
-        self.enemies = [e for e in self.enemies if e.alive() and e.pos.y < s.H + 80]
-        self.powerups = [p for p in self.powerups if p.pos.y < s.H + 40]
+        self.friendly_bullets.cull(s.W, s.H)
+        self.enemy_bullets.cull(s.W, s.H)
+        compact(self.enemies, lambda e: e.alive() and e.pos_y < s.H + 80)
+        compact(self.powerups, lambda p: p.pos_y < s.H + 40)
 
         if not self.player.is_alive():
             self.on_game_over(self.score)
@@ -189,38 +221,59 @@ class PlayState:
     def resolve_collisions(self):
         s = self.settings
         # Player bullets -> enemies
-        for b in [bb for bb in self.bullets if bb.friendly]:
-            br = b.rect()
+        bp = self.friendly_bullets
+        friendly_idx = np.flatnonzero(bp.alive[:bp.count])
+        # Rebuilding the grid costs an insert per enemy every frame; it only
+        # pays off once there are enough bullet/enemy pairs to test
+        use_grid = len(self.enemies) * len(friendly_idx) >= self.GRID_MIN_PAIRS
+        if use_grid:
+            grid = self.grid
+            grid.clear()
             for e in self.enemies:
-                if e.alive() and br.colliderect(e.rect()):
-                    e.damage(b.damage)
-                    b.pos.y = -10_000  # remove bullet
+                if e.alive():
+                    grid.insert(e, e.pos_x, e.pos_y, e.radius)
+
+        for i, bx, by, r, dmg in zip(friendly_idx.tolist(), bp.pos_x[friendly_idx].tolist(),
+                                     bp.pos_y[friendly_idx].tolist(), bp.radius[friendly_idx].tolist(),
+                                     bp.damage[friendly_idx].tolist()):
+            candidates = grid.query(bx, by, r) if use_grid else self.enemies
+            for e in candidates:
+                if e.alive() and circles_hit(bx, by, r, e.pos_x, e.pos_y, e.radius):
+                    e.damage(dmg)
+                    bp.kill(i)
                     if not e.alive():
                         pts = int(100 * (1.0 + 0.06 * self.wave_mgr.wave_index) * self.multiplier)
                         self.score += pts
-                        self.maybe_drop_powerup(e.pos.x, e.pos.y)
+                        self.maybe_drop_powerup(e.pos_x, e.pos_y)
                     break
 
         # Enemy bullets -> player
-        pr = pygame.Rect(int(self.player.pos.x - self.player.radius), int(self.player.pos.y - self.player.radius),
-                         self.player.radius * 2, self.player.radius * 2)
-
-        for b in [bb for bb in self.bullets if not bb.friendly]:
-            if b.rect().colliderect(pr):
-                b.pos.y = -10_000
+        px, py, pr = self.player.pos.x, self.player.pos.y, self.player.radius
+
+        # Single target: box-reject the whole pool at once, then circle-test
+        # the handful of bullets left near the player
+        bp = self.enemy_bullets
+        n = bp.count
+        reach = bp.radius[:n] + pr
+        near = (np.abs(bp.pos_x[:n] - px) <= reach) & (np.abs(bp.pos_y[:n] - py) <= reach) & bp.alive[:n]
+        hostile_idx = np.flatnonzero(near)
+        for i, bx, by, r in zip(hostile_idx.tolist(), bp.pos_x[hostile_idx].tolist(),
+                                bp.pos_y[hostile_idx].tolist(), bp.radius[hostile_idx].tolist()):
+            if circles_hit(bx, by, r, px, py, pr):
+                bp.kill(i)
                 took_damage = self.player.hit()
                 if took_damage:
                     self.flash = 0.18
 
         # Player -> powerup
         for pu in self.powerups:
-            if pu.rect().colliderect(pr):
+            if circles_hit(pu.pos_x, pu.pos_y, pu.radius, px, py, pr):
                 self.apply_powerup(pu.kind)
-                pu.pos.y = 10_000
+                pu.pos_y = 10_000
 
         # Player -> enemy collision (ram)
         for e in self.enemies:
-            if e.rect().colliderect(pr):
+            if circles_hit(e.pos_x, e.pos_y, e.radius, px, py, pr):
                 e.hp = 0
                 took_damage = self.player.hit()
                 if took_damage:
@@ -229,28 +282,34 @@ class PlayState:
                 self.score += int(60 * self.multiplier)
 
     def render(self, surf):
+        # Returns the list of changed areas, or None when the whole screen
+        # must be presented.
         s = self.settings
-        surf.fill(s.BG)
-        self.starfield.draw(surf)
+        prev = self._prev_rects
+        if prev is None:
+            surf.blit(self._background, (0, 0))
+        else:
+            bg = self._background
+            surf.blits([(bg, r, r) for r in prev], doreturn=False)
+
+        drawn = self.starfield.draw(surf)
 
         # bullets
-        for b in self.bullets:
-            b.draw(surf, s)
+        drawn += self.friendly_bullets.draw(surf, s)
+        drawn += self.enemy_bullets.draw(surf, s)
 
         # enemies
-        for e in self.enemies:
-            e.draw(surf)
+        drawn += surf.blits([e.blit_op() for e in self.enemies])
 
         # powerups
-        for pu in self.powerups:
-            pu.draw(surf)
+        drawn += surf.blits([pu.blit_op() for pu in self.powerups])
 
         # player
         if self.player.is_alive():
-            self.player.draw(surf)
+            drawn.append(self.player.draw(surf))
 
         # HUD
-        self.hud.draw(
+        drawn += self.hud.draw(
             surf,
             score=self.score,
             wave=self.wave_mgr.wave_index,
@@ -261,9 +320,15 @@ class PlayState:
         )
 
         if self.flash > 0:
-            overlay = pygame.Surface((s.W, s.H), pygame.SRCALPHA)
-            overlay.fill((255, 80, 90, int(120 * (self.flash / 0.18))))
-            surf.blit(overlay, (0, 0))
+            self._flash_overlay.set_alpha(int(120 * (self.flash / 0.18)))
+            surf.blit(self._flash_overlay, (0, 0))
+
+        if prev is None or self.paused or self.flash > 0:
+            # tinted/paused frames touch everything; restore fully next frame
+            self._prev_rects = None if (self.paused or self.flash > 0) else drawn
+            return None
+        self._prev_rects = drawn
+        return prev + drawn
 
 
 class MenuState:
@@ -372,5 +437,7 @@ class Game:
             self.state.update(dt)
 
     def render(self, surf):
+        # Returns dirty rects from the active state, or None for a full flip
         if self.state:
-            self.state.render(surf)
+            return self.state.render(surf)
+        return None
@@ -1,11 +1,32 @@
+from collections import OrderedDict
+
 import pygame
 
 class HUD:
+    CACHE_SIZE = 64  # rendered strings kept per field
+
     def __init__(self, settings):
         self.settings = settings
         self.font = pygame.font.SysFont("consolas", 18)
         self.font_big = pygame.font.SysFont("consolas", 34, bold=True)
 
+        # font.render is slow; keep recent text surfaces per field (LRU)
+        self._cache = {}  # field -> OrderedDict[text -> Surface]
+        self._paused = self.font_big.render("PAUSED", True, settings.FG)
+
+    def _get(self, key, text, color):
+        cache = self._cache.get(key)
+        if cache is None:
+            cache = self._cache[key] = OrderedDict()
+        surf = cache.get(text)
+        if surf is None:
+            surf = cache[text] = self.font.render(text, True, color)
+            if len(cache) > self.CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(text)
+        return surf
+
     def draw(self, surf, score, wave, lives, multiplier, powerup_text, paused=False):
         s = self.settings
         # Top bar text
@@ -13,18 +34,22 @@ class HUD:
         mid = f"Wave: {wave}"
         right = f"Lives: {lives}   x{multiplier:.1f}"
 
-        tl = self.font.render(left, True, s.FG)
-        tm = self.font.render(mid, True, s.FG)
-        tr = self.font.render(right, True, s.FG)
+        tl = self._get("left", left, s.FG)
+        tm = self._get("mid", mid, s.FG)
+        tr = self._get("right", right, s.FG)
 
-        surf.blit(tl, (18, 12))
-        surf.blit(tm, (s.W / 2 - tm.get_width() / 2, 12))
-        surf.blit(tr, (s.W - tr.get_width() - 18, 12))
+        # returns the touched areas for dirty-rect presentation
+        areas = [
+            surf.blit(tl, (18, 12)),
+            surf.blit(tm, (s.W / 2 - tm.get_width() / 2, 12)),
+            surf.blit(tr, (s.W - tr.get_width() - 18, 12)),
+        ]
 
         if powerup_text:
-            pu = self.font.render(powerup_text, True, (190, 255, 190))
-            surf.blit(pu, (18, 38))
+            pu = self._get("powerup", powerup_text, (190, 255, 190))
+            areas.append(surf.blit(pu, (18, 38)))
 
         if paused:
-            msg = self.font_big.render("PAUSED", True, s.FG)
-            surf.blit(msg, (s.W / 2 - msg.get_width() / 2, s.H / 2 - msg.get_height() / 2))
+            msg = self._paused
+            areas.append(surf.blit(msg, (s.W / 2 - msg.get_width() / 2, s.H / 2 - msg.get_height() / 2)))
+        return areas